@@ -8,11 +8,17 @@ Objectif : produire un AST dont la structure ressemble au schéma du cours :
 - Paramètres : chaîne de nœuds 'param'
 - Appel avec paramètres : ('callParam', nom_fonction, exp_chain)
 - Liste d'arguments : chaîne de nœuds 'exp'
+
+En mémoire, l'AST est fait de nœuds compacts (Noeud1..Noeud4, avec __slots__)
+portant un code d'opération entier ; vers_tuple / depuis_tuple passent de l'une
+à l'autre forme (affichage console et Graphviz utilisent la forme tuple).
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 try:
     from genereTreeGraphviz2 import printTreeGraph
@@ -27,6 +33,19 @@ except Exception:
 PREFIXE_CONSOLE = "calc > "
 AFFICHER_GRAPHVIZ = True  # Doit rester désactivé par défaut (sujet)
 
+INLINING_ACTIF = True
+TAILLE_MAX_INLINING = 16  # nombre maximal de nœuds de l'expression retournée
+AFFICHER_RAPPORT_INLINING = False
+
+OPTIMISATION_BOUCLES_ACTIVE = True
+
+JIT_ACTIF = True
+SEUIL_JIT = 50  # nombre d'appels avant traduction d'une fonction en Python
+
+MAP_PARALLELE_ACTIF = True
+TAILLE_MIN_PARALLELE = 20000  # en dessous, map / reduce restent en série
+NOMBRE_PROCESSUS = os.cpu_count() or 1
+
 
 # ---------------------------------------------------------------------------
 # Analyse lexicale
@@ -45,6 +64,10 @@ mots_reserves = {
     "fonction": "FUNCTION",   # IMPORTANT : le cours utilise "fonction"
     "function": "FUNCTION",   # on accepte aussi "function"
     "return": "RETURN",
+    "in": "IN",
+    "del": "DEL",
+    "map": "MAP",
+    "reduce": "REDUCE",
 }
 
 tokens = [
@@ -72,6 +95,7 @@ tokens = [
     "LBRACKET",
     "RBRACKET",
     "DOT",
+    "COLON",
 ] + list(set(mots_reserves.values()))
 
 t_PLUSPLUS = r"\+\+"
@@ -97,6 +121,7 @@ t_COMMA = r","
 t_SEMI = r";"
 t_EGAL = r"="
 t_DOT = r"\."
+t_COLON = r":"
 
 
 def t_NAME(production):
@@ -129,6 +154,252 @@ import ply.lex as lex
 analyseur_lexical = lex.lex()
 
 
+# ---------------------------------------------------------------------------
+# Noeuds de l'AST : codes d'opération entiers et classes à __slots__
+# ---------------------------------------------------------------------------
+
+# Etiquettes de la forme tuple (schéma du cours, Graphviz, affichage console).
+# La position d'une étiquette dans ce tuple est le code d'opération du nœud.
+ETIQUETTES: Tuple[str, ...] = (
+    "PROG", "fonction", "main", "inst",
+    "print", "assign", "++", "call", "callParam", "return",
+    "assign_index_tab", "push", "pop_inst",
+    "if", "while", "for",
+    "definition",
+    "param", "exp",
+    "+", "-", "*", "/", "<", "<=", ">", "==", "and", "or",
+    "array", "index", "len", "pop_exp",
+    "map", "paire", "in", "del", "for_in",
+    "map_tab", "reduce_tab",
+)
+CODES: Dict[str, int] = {etiquette: code for code, etiquette in enumerate(ETIQUETTES)}
+
+OP_PROG = CODES["PROG"]
+OP_FONCTION = CODES["fonction"]
+OP_MAIN = CODES["main"]
+OP_INST = CODES["inst"]
+OP_PRINT = CODES["print"]
+OP_ASSIGN = CODES["assign"]
+OP_INCREMENT = CODES["++"]
+OP_CALL = CODES["call"]
+OP_CALL_PARAM = CODES["callParam"]
+OP_RETURN = CODES["return"]
+OP_ASSIGN_INDEX_TAB = CODES["assign_index_tab"]
+OP_PUSH = CODES["push"]
+OP_POP_INST = CODES["pop_inst"]
+OP_IF = CODES["if"]
+OP_WHILE = CODES["while"]
+OP_FOR = CODES["for"]
+OP_DEFINITION = CODES["definition"]  # (nom, param_chain ou 'empty', corps_inst) sans étiquette
+OP_PARAM = CODES["param"]
+OP_EXP = CODES["exp"]
+OP_PLUS = CODES["+"]
+OP_MOINS = CODES["-"]
+OP_FOIS = CODES["*"]
+OP_DIVISE = CODES["/"]
+OP_INF = CODES["<"]
+OP_INF_EGAL = CODES["<="]
+OP_SUP = CODES[">"]
+OP_EGAL_EGAL = CODES["=="]
+OP_ET = CODES["and"]
+OP_OU = CODES["or"]
+OP_ARRAY = CODES["array"]
+OP_INDEX = CODES["index"]
+OP_LEN = CODES["len"]
+OP_POP_EXP = CODES["pop_exp"]
+OP_MAP = CODES["map"]
+OP_PAIRE = CODES["paire"]
+OP_IN = CODES["in"]
+OP_DEL = CODES["del"]
+OP_FOR_IN = CODES["for_in"]
+OP_MAP_TAB = CODES["map_tab"]
+OP_REDUCE_TAB = CODES["reduce_tab"]
+
+# Codes spécialisés (quickening, voir "Caches en ligne") : ils prolongent la
+# numérotation et s'affichent avec l'étiquette de leur code générique.
+(
+    OP_PLUS_ENTIERS,
+    OP_MOINS_ENTIERS,
+    OP_FOIS_ENTIERS,
+    OP_INF_ENTIERS,
+    OP_INF_EGAL_ENTIERS,
+    OP_SUP_ENTIERS,
+    OP_EGAL_EGAL_ENTIERS,
+    OP_INDEX_LISTE_ENTIER,
+) = range(len(ETIQUETTES), len(ETIQUETTES) + 8)
+
+# code générique -> code spécialisé
+SPECIALISATION: Dict[int, int] = {
+    OP_PLUS: OP_PLUS_ENTIERS,
+    OP_MOINS: OP_MOINS_ENTIERS,
+    OP_FOIS: OP_FOIS_ENTIERS,
+    OP_INF: OP_INF_ENTIERS,
+    OP_INF_EGAL: OP_INF_EGAL_ENTIERS,
+    OP_SUP: OP_SUP_ENTIERS,
+    OP_EGAL_EGAL: OP_EGAL_EGAL_ENTIERS,
+    OP_INDEX: OP_INDEX_LISTE_ENTIER,
+}
+
+# code générique -> types (gauche, droite) attendus par le chemin spécialisé
+TYPES_SPECIALISES: Dict[int, Tuple[type, type]] = {
+    OP_PLUS: (int, int),
+    OP_MOINS: (int, int),
+    OP_FOIS: (int, int),
+    OP_INF: (int, int),
+    OP_INF_EGAL: (int, int),
+    OP_SUP: (int, int),
+    OP_EGAL_EGAL: (int, int),
+    OP_INDEX: (list, int),
+}
+
+# Codes internes posés par l'optimiseur de boucles, transparents dans la forme tuple
+OP_INVARIANT, OP_BOUCLE_OPTIMISEE = range(len(ETIQUETTES) + len(SPECIALISATION), len(ETIQUETTES) + len(SPECIALISATION) + 2)
+CODES_TRANSPARENTS = {OP_INVARIANT, OP_BOUCLE_OPTIMISEE}
+
+NB_CODES = len(ETIQUETTES) + len(SPECIALISATION) + len(CODES_TRANSPARENTS)
+
+# code (générique ou spécialisé) -> code générique
+CODE_GENERIQUE: List[int] = list(range(NB_CODES))
+for code_generique, code_specialise in SPECIALISATION.items():
+    CODE_GENERIQUE[code_specialise] = code_generique
+
+
+class Noeud:
+    """
+    Noeud de l'AST : un code d'opération entier et des enfants dans des slots fixes.
+
+    Les feuilles restent des valeurs Python (int pour les nombres, str pour les
+    noms) et le 'empty' du cours devient None.
+    """
+
+    __slots__ = ("code",)
+
+    def __init__(self, code: int):
+        self.code = code
+
+    def enfants(self) -> Tuple[Any, ...]:
+        return ()
+
+    def __repr__(self) -> str:
+        return repr(vers_tuple(self))
+
+
+class Noeud1(Noeud):
+    __slots__ = ("a",)
+
+    def __init__(self, code: int, a: Any):
+        self.code = code
+        self.a = a
+
+    def enfants(self) -> Tuple[Any, ...]:
+        return (self.a,)
+
+
+class Noeud2(Noeud1):
+    __slots__ = ("b",)
+
+    def __init__(self, code: int, a: Any, b: Any):
+        self.code = code
+        self.a = a
+        self.b = b
+
+    def enfants(self) -> Tuple[Any, ...]:
+        return (self.a, self.b)
+
+
+class Noeud3(Noeud2):
+    __slots__ = ("c",)
+
+    def __init__(self, code: int, a: Any, b: Any, c: Any):
+        self.code = code
+        self.a = a
+        self.b = b
+        self.c = c
+
+    def enfants(self) -> Tuple[Any, ...]:
+        return (self.a, self.b, self.c)
+
+
+class Noeud4(Noeud3):
+    __slots__ = ("d",)
+
+    def __init__(self, code: int, a: Any, b: Any, c: Any, d: Any):
+        self.code = code
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+
+    def enfants(self) -> Tuple[Any, ...]:
+        return (self.a, self.b, self.c, self.d)
+
+
+class NoeudOperation(Noeud2):
+    """
+    Site d'opération binaire (arithmétique, comparaison, index) avec cache en ligne.
+
+    compteur : nombre d'observations consécutives des types attendus ; -1 quand
+    le site a été déspécialisé et reste définitivement générique.
+    """
+
+    __slots__ = ("compteur",)
+
+    def __init__(self, code: int, a: Any, b: Any):
+        self.code = code
+        self.a = a
+        self.b = b
+        self.compteur = 0
+
+
+CLASSES_PAR_ARITE = (Noeud, Noeud1, Noeud2, Noeud3, Noeud4)
+
+
+def creer_noeud(code: int, *enfants: Any) -> Noeud:
+    if code in SPECIALISATION:
+        return NoeudOperation(code, *enfants)
+    return CLASSES_PAR_ARITE[len(enfants)](code, *enfants)
+
+
+def vers_tuple(arbre: Any) -> Any:
+    # Noeud -> forme tuple du cours : ('+', 1, 'x'), 'empty', ...
+    if arbre is None:
+        return "empty"
+    if not isinstance(arbre, Noeud):
+        return arbre
+    if arbre.code in CODES_TRANSPARENTS:
+        return vers_tuple(arbre.a)
+    enfants = tuple(vers_tuple(enfant) for enfant in arbre.enfants())
+    if arbre.code == OP_DEFINITION:
+        return enfants
+    return (ETIQUETTES[CODE_GENERIQUE[arbre.code]],) + enfants
+
+
+def depuis_tuple(arbre: Any) -> Any:
+    # Forme tuple du cours -> Noeud (inverse de vers_tuple)
+    if arbre == "empty":
+        return None
+    if not isinstance(arbre, tuple):
+        return arbre
+    etiquette = arbre[0]
+    if etiquette == "fonction" and len(arbre) == 3:
+        # Le second enfant est une définition : son nom peut coïncider avec une étiquette ('index', 'call', ...)
+        return Noeud2(OP_FONCTION, depuis_tuple(arbre[1]), depuis_tuple_definition(arbre[2]))
+    if etiquette in CODES and etiquette != "definition":
+        return creer_noeud(CODES[etiquette], *[depuis_tuple(enfant) for enfant in arbre[1:]])
+    if len(arbre) == 3 and isinstance(etiquette, str):
+        return depuis_tuple_definition(arbre)
+    raise TypeError(f"Noeud invalide : {arbre!r}")
+
+
+def depuis_tuple_definition(arbre: Any) -> Any:
+    # ('nom_fonction', param_chain ou 'empty', corps_inst)
+    if arbre == "empty":
+        return None
+    if not (isinstance(arbre, tuple) and len(arbre) == 3 and isinstance(arbre[0], str)):
+        raise TypeError(f"Définition invalide : {arbre!r}")
+    return Noeud3(OP_DEFINITION, arbre[0], depuis_tuple(arbre[1]), depuis_tuple(arbre[2]))
+
+
 # ---------------------------------------------------------------------------
 # Analyse syntaxique
 # ---------------------------------------------------------------------------
@@ -136,7 +407,7 @@ analyseur_lexical = lex.lex()
 precedence = (
     ("left", "OR"),
     ("left", "AND"),
-    ("nonassoc", "INF", "INFEG", "EGALEGAL", "SUP"),
+    ("nonassoc", "INF", "INFEG", "EGALEGAL", "SUP", "IN"),
     ("left", "PLUS", "MINUS"),
     ("left", "TIMES", "DIVIDE"),
 )
@@ -144,7 +415,7 @@ precedence = (
 
 def p_empty(production):
     "empty :"
-    production[0] = "empty"
+    production[0] = None
 
 
 def p_start(production):
@@ -155,19 +426,20 @@ def p_start(production):
     arbre_fonctions, arbre_main = separer_fonctions_et_main(liste_complete)
 
     # Le schéma du cours montre toujours un nœud "fonction"
-    if arbre_fonctions == "empty":
-        arbre_fonctions = ("fonction", "empty", "empty")
+    if arbre_fonctions is None:
+        arbre_fonctions = Noeud2(OP_FONCTION, None, None)
 
-    production[0] = ("PROG", arbre_fonctions, ("main", arbre_main))
+    production[0] = Noeud2(OP_PROG, arbre_fonctions, Noeud1(OP_MAIN, arbre_main))
 
-    # AST visible en console
-    print(production[0])
+    # AST visible en console (forme tuple du cours)
+    arbre_tuple = vers_tuple(production[0])
+    print(arbre_tuple)
 
     # Graphviz optionnel (doit rester commenté / désactivé par défaut)
     if AFFICHER_GRAPHVIZ:
         if printTreeGraph is None:
             raise ImportError("genereTreeGraphviz2.py introuvable.")
-        printTreeGraph(production[0])
+        printTreeGraph(arbre_tuple)
 
     executer_instruction(production[0])
 
@@ -180,7 +452,7 @@ def p_opt_semi(production):
     """opt_semi : SEMI
                 | empty
     """
-    production[0] = "empty"
+    production[0] = None
 
 
 def p_element(production):
@@ -195,9 +467,9 @@ def p_liste_instructions(production):
                           | empty
     """
     if len(production) == 3:
-        production[0] = ("inst", production[1], production[2])
+        production[0] = Noeud2(OP_INST, production[1], production[2])
     else:
-        production[0] = "empty"
+        production[0] = None
 
 
 def p_bloc(production):
@@ -211,49 +483,53 @@ def p_bloc(production):
 
 def p_instruction_simple_affectation(production):
     "instruction_simple : NAME EGAL expression"
-    production[0] = ("assign", production[1], production[3])
+    production[0] = Noeud2(OP_ASSIGN, production[1], production[3])
 
 
 def p_instruction_simple_affichage(production):
     "instruction_simple : PRINT LPAREN expression RPAREN"
-    production[0] = ("print", production[3])
+    production[0] = Noeud1(OP_PRINT, production[3])
 
 
 def p_instruction_simple_post_incrementation(production):
     "instruction_simple : NAME PLUSPLUS"
-    production[0] = ("++", production[1])
+    production[0] = Noeud1(OP_INCREMENT, production[1])
 
 
 def p_instruction_simple_appel_fonction_sans_parametres(production):
     "instruction_simple : NAME LPAREN RPAREN"
-    production[0] = ("call", production[1])
+    production[0] = Noeud1(OP_CALL, production[1])
 
 
 def p_instruction_simple_appel_fonction_avec_parametres(production):
     "instruction_simple : NAME LPAREN liste_expressions RPAREN"
-    production[0] = ("callParam", production[1], production[3])
+    production[0] = Noeud2(OP_CALL_PARAM, production[1], production[3])
 
 
 def p_instruction_simple_return_expression(production):
     "instruction_simple : RETURN expression"
-    production[0] = ("return", production[2])
+    production[0] = Noeud1(OP_RETURN, production[2])
 
 
 def p_instruction_simple_return_vide(production):
     "instruction_simple : RETURN"
-    production[0] = ("return", "empty")
+    production[0] = Noeud1(OP_RETURN, None)
 
 def p_instruction_simple_affectation_index_tableau(production):
     "instruction_simple : NAME LBRACKET expression RBRACKET EGAL expression"
-    production[0] = ("assign_index_tab", production[1], production[3], production[6])
+    production[0] = Noeud3(OP_ASSIGN_INDEX_TAB, production[1], production[3], production[6])
 
 def p_instruction_simple_push_tableau(production):
     "instruction_simple : PUSH LPAREN NAME COMMA expression RPAREN"
-    production[0] = ("push", production[3], production[5])
+    production[0] = Noeud2(OP_PUSH, production[3], production[5])
 
 def p_instruction_simple_pop_tableau(production):
     "instruction_simple : POP LPAREN NAME RPAREN"
-    production[0] = ("pop_inst", production[3])
+    production[0] = Noeud1(OP_POP_INST, production[3])
+
+def p_instruction_simple_del_dictionnaire(production):
+    "instruction_simple : DEL LPAREN NAME COMMA expression RPAREN"
+    production[0] = Noeud2(OP_DEL, production[3], production[5])
 
 
 # -----------------------
@@ -262,27 +538,27 @@ def p_instruction_simple_pop_tableau(production):
 
 def p_instruction_composee_if(production):
     "instruction_composee : IF LPAREN expression RPAREN bloc"
-    production[0] = ("if", production[3], production[5], "empty")
+    production[0] = Noeud3(OP_IF, production[3], production[5], None)
 
 
 def p_instruction_composee_if_else(production):
     "instruction_composee : IF LPAREN expression RPAREN bloc ELSE bloc"
-    production[0] = ("if", production[3], production[5], production[7])
+    production[0] = Noeud3(OP_IF, production[3], production[5], production[7])
 
 def p_instruction_composee_if_elif(production):
     "instruction_composee : IF LPAREN expression RPAREN bloc ELIF LPAREN expression RPAREN bloc"
-    branch_elif = ("if", production[8], production[10], "empty")
-    production[0] = ("if", production[3], production[5], branch_elif)
+    branch_elif = Noeud3(OP_IF, production[8], production[10], None)
+    production[0] = Noeud3(OP_IF, production[3], production[5], branch_elif)
 
 def p_instruction_composee_if_elif_else(production):
     "instruction_composee : IF LPAREN expression RPAREN bloc ELIF LPAREN expression RPAREN bloc ELSE bloc"
-    branch_elif = ("if", production[8], production[10], production[12])
-    production[0] = ("if", production[3], production[5], branch_elif) 
+    branch_elif = Noeud3(OP_IF, production[8], production[10], production[12])
+    production[0] = Noeud3(OP_IF, production[3], production[5], branch_elif) 
 
 
 def p_instruction_composee_while(production):
     "instruction_composee : WHILE LPAREN expression RPAREN bloc"
-    production[0] = ("while", production[3], production[5])
+    production[0] = Noeud2(OP_WHILE, production[3], production[5])
 
 
 def p_instruction_for(production):
@@ -290,27 +566,33 @@ def p_instruction_for(production):
                        | NAME PLUSPLUS
     """
     if len(production) == 4:
-        production[0] = ("assign", production[1], production[3])
+        production[0] = Noeud2(OP_ASSIGN, production[1], production[3])
     else:
-        production[0] = ("++", production[1])
+        production[0] = Noeud1(OP_INCREMENT, production[1])
 
 
 def p_instruction_composee_for(production):
     "instruction_composee : FOR LPAREN instruction_for SEMI expression SEMI instruction_for opt_semi RPAREN bloc"
     # ('for', init, condition, increment, corps_inst)
-    production[0] = ("for", production[3], production[5], production[7], production[10])
+    production[0] = Noeud4(OP_FOR, production[3], production[5], production[7], production[10])
+
+
+def p_instruction_composee_for_in(production):
+    "instruction_composee : FOR LPAREN NAME IN expression RPAREN bloc"
+    # ('for_in', variable, conteneur, corps_inst) : clés d'un dictionnaire, éléments d'un tableau
+    production[0] = Noeud3(OP_FOR_IN, production[3], production[5], production[7])
 
 
 def p_instruction_composee_definition_fonction_sans_parametres(production):
     "instruction_composee : FUNCTION NAME LPAREN RPAREN bloc"
     # ('nom_fonction', 'empty', corps_inst)
-    production[0] = (production[2], "empty", production[5])
+    production[0] = Noeud3(OP_DEFINITION, production[2], None, production[5])
 
 
 def p_instruction_composee_definition_fonction_avec_parametres(production):
     "instruction_composee : FUNCTION NAME LPAREN liste_parametres RPAREN bloc"
     # ('nom_fonction', param_chain, corps_inst)
-    production[0] = (production[2], production[4], production[6])
+    production[0] = Noeud3(OP_DEFINITION, production[2], production[4], production[6])
 
 
 # -----------------------
@@ -322,12 +604,12 @@ def p_instruction_composee_definition_fonction_avec_parametres(production):
 
 def p_liste_parametres_base(production):
     "liste_parametres : NAME"
-    production[0] = ("param", production[1])
+    production[0] = Noeud1(OP_PARAM, production[1])
 
 
 def p_liste_parametres_recursion(production):
     "liste_parametres : liste_parametres COMMA NAME"
-    production[0] = ("param", production[1], production[3])
+    production[0] = Noeud2(OP_PARAM, production[1], production[3])
 
 # -----------------------
 # Liste d'expressions (arguments) : nœuds 'exp'
@@ -337,12 +619,12 @@ def p_liste_parametres_recursion(production):
 
 def p_liste_expressions_base(production):
     "liste_expressions : expression"
-    production[0] = ("exp", production[1])
+    production[0] = Noeud1(OP_EXP, production[1])
 
 
 def p_liste_expressions_recursion(production):
     "liste_expressions : liste_expressions COMMA expression"
-    production[0] = ("exp", production[1], production[3])
+    production[0] = Noeud2(OP_EXP, production[1], production[3])
 
 
 # -----------------------
@@ -366,82 +648,117 @@ def p_expression_parentheses(production):
 
 def p_expression_binaire_plus(production):
     "expression : expression PLUS expression"
-    production[0] = ("+", production[1], production[3])
+    production[0] = NoeudOperation(OP_PLUS, production[1], production[3])
 
 
 def p_expression_binaire_moins(production):
     "expression : expression MINUS expression"
-    production[0] = ("-", production[1], production[3])
+    production[0] = NoeudOperation(OP_MOINS, production[1], production[3])
 
 
 def p_expression_binaire_fois(production):
     "expression : expression TIMES expression"
-    production[0] = ("*", production[1], production[3])
+    production[0] = NoeudOperation(OP_FOIS, production[1], production[3])
 
 
 def p_expression_binaire_division(production):
     "expression : expression DIVIDE expression"
-    production[0] = ("/", production[1], production[3])
+    production[0] = Noeud2(OP_DIVISE, production[1], production[3])
 
 
 def p_expression_binaire_inf(production):
     "expression : expression INF expression"
-    production[0] = ("<", production[1], production[3])
+    production[0] = NoeudOperation(OP_INF, production[1], production[3])
 
 
 def p_expression_binaire_inf_egal(production):
     "expression : expression INFEG expression"
-    production[0] = ("<=", production[1], production[3])
+    production[0] = NoeudOperation(OP_INF_EGAL, production[1], production[3])
 
 
 def p_expression_binaire_sup(production):
     "expression : expression SUP expression"
-    production[0] = (">", production[1], production[3])
+    production[0] = NoeudOperation(OP_SUP, production[1], production[3])
 
 
 def p_expression_binaire_egal_egal(production):
     "expression : expression EGALEGAL expression"
-    production[0] = ("==", production[1], production[3])
+    production[0] = NoeudOperation(OP_EGAL_EGAL, production[1], production[3])
 
 
 def p_expression_binaire_et(production):
     "expression : expression AND expression"
-    production[0] = ("and", production[1], production[3])
+    production[0] = Noeud2(OP_ET, production[1], production[3])
 
 
 def p_expression_binaire_ou(production):
     "expression : expression OR expression"
-    production[0] = ("or", production[1], production[3])
+    production[0] = Noeud2(OP_OU, production[1], production[3])
 
 # Ajout : appel de fonction comme expression (sans paramètres)
 def p_expression_appel_fonction_sans_parametres(production):
     "expression : NAME LPAREN RPAREN"
-    production[0] = ("call", production[1])
+    production[0] = Noeud1(OP_CALL, production[1])
 
 # Ajout : appel de fonction comme expression (avec paramètres)
 def p_expression_appel_fonction_avec_parametres(production):
     "expression : NAME LPAREN liste_expressions RPAREN"
-    production[0] = ("callParam", production[1], production[3])
+    production[0] = Noeud2(OP_CALL_PARAM, production[1], production[3])
 
 def p_expression_tableau_vide(production):
     "expression : LBRACKET RBRACKET"
-    production[0] = ("array", "empty")
+    production[0] = Noeud1(OP_ARRAY, None)
 
 def p_expression_tableau(production):
     "expression : LBRACKET liste_expressions RBRACKET"
-    production[0] = ("array", production[2])
+    production[0] = Noeud1(OP_ARRAY, production[2])
 
 def p_expression_index_tableau(production):
     "expression : NAME LBRACKET expression RBRACKET"
-    production[0] = ("index", production[1], production[3])
+    production[0] = NoeudOperation(OP_INDEX, production[1], production[3])
 
 def p_expression_len_tableau(production):
     "expression : LEN DOT NAME"
-    production[0] = ("len", production[3])
+    production[0] = Noeud1(OP_LEN, production[3])
 
 def p_expression_tableau_pop_tableau(production):
     "expression : POP LPAREN NAME RPAREN"
-    production[0] = ("pop_exp", production[3])
+    production[0] = Noeud1(OP_POP_EXP, production[3])
+
+def p_expression_map_tableau(production):
+    "expression : MAP LPAREN NAME COMMA expression RPAREN"
+    production[0] = Noeud2(OP_MAP_TAB, production[3], production[5])
+
+def p_expression_reduce_tableau(production):
+    "expression : REDUCE LPAREN NAME COMMA expression COMMA expression RPAREN"
+    production[0] = Noeud3(OP_REDUCE_TAB, production[3], production[5], production[7])
+
+def p_expression_appartenance(production):
+    "expression : expression IN expression"
+    production[0] = Noeud2(OP_IN, production[1], production[3])
+
+def p_expression_dictionnaire_vide(production):
+    "expression : LACC RACC"
+    production[0] = Noeud1(OP_MAP, None)
+
+def p_expression_dictionnaire(production):
+    "expression : LACC liste_paires RACC"
+    production[0] = Noeud1(OP_MAP, production[2])
+
+
+# -----------------------
+# Paires clé : valeur d'un dictionnaire : nœuds 'paire'
+# Base : ('paire', cle, valeur)
+# Récursif : ('paire', ('paire', cle1, valeur1), cle2, valeur2)
+# -----------------------
+
+def p_liste_paires_base(production):
+    "liste_paires : expression COLON expression"
+    production[0] = Noeud2(OP_PAIRE, production[1], production[3])
+
+def p_liste_paires_recursion(production):
+    "liste_paires : liste_paires COMMA expression COLON expression"
+    production[0] = Noeud3(OP_PAIRE, production[1], production[3], production[5])
 
 
 def p_error(production):
@@ -466,8 +783,30 @@ class SignalRetour(Exception):
         self.valeur = valeur
 
 
+class Fonction:
+    """Entrée de 'fonctions' : définition, compteur d'appels et version compilée (JIT)."""
+
+    __slots__ = ("noeud_parametres", "corps", "parametres", "appels", "compilee", "compilable")
+
+    def __init__(self, noeud_parametres: Any, corps: Any):
+        self.noeud_parametres = noeud_parametres
+        self.corps = corps
+        self.parametres = extraire_parametres_depuis_param_chain(noeud_parametres)
+        self.appels = 0
+        self.compilee: Optional[Callable[..., Any]] = None
+        self.compilable = True
+
+
 pile_des_contextes: List[Dict[str, Any]] = [{}]
-fonctions: Dict[str, Tuple[Any, Any]] = {}
+fonctions: Dict[str, Fonction] = {}
+
+
+def reinitialiser_etat() -> None:
+    # Etat d'interpréteur neuf : un programme par requête du serveur (serveurCalc.py)
+    pile_des_contextes[:] = [{}]
+    fonctions.clear()
+    analyseur_lexical.lineno = 1
+
 
 def lire_variable(nom: str) -> Any:
     for contexte in reversed(pile_des_contextes):
@@ -482,26 +821,18 @@ def ecrire_variable(nom: str, valeur: Any) -> None:
 
 
 def est_definition_fonction(instruction: Any) -> bool:
-    
-    # Définition : (nom, param_chain ou 'empty', corps_inst)
-    if not isinstance(instruction, tuple) or len(instruction) != 3:
-        return False
-    if not isinstance(instruction[0], str):
-        return False
-    if instruction[0] in {"if", "while", "for", "print", "assign", "++", "push", "pop_inst", "assign_index_tab"}:
-        return False
-    corps = instruction[2]
-    return corps == "empty" or (isinstance(corps, tuple) and corps[0] == "inst")
+    # Définition : Noeud3(OP_DEFINITION, nom, param_chain ou None, corps_inst)
+    return isinstance(instruction, Noeud) and instruction.code == OP_DEFINITION
 
 
 def liste_instructions_vers_liste_python(liste_instructions: Any) -> List[Any]:
     resultat: List[Any] = []
     courant = liste_instructions
-    while courant != "empty":
-        if not (isinstance(courant, tuple) and courant[0] == "inst"):
+    while courant is not None:
+        if not (isinstance(courant, Noeud) and courant.code == OP_INST):
             raise TypeError(f"Liste d'instructions invalide : {courant!r}")
-        resultat.append(courant[1])
-        courant = courant[2]
+        resultat.append(courant.a)
+        courant = courant.b
     return resultat
 
 
@@ -518,279 +849,1278 @@ def separer_fonctions_et_main(liste_instructions: Any) -> Tuple[Any, Any]:
             instructions_main.append(instruction)
 
     # Chaîne "fonction" : ('fonction', precedent, definition)
-    arbre_fonctions: Any = "empty"
+    arbre_fonctions: Any = None
     for definition in definitions_fonctions:
-        arbre_fonctions = ("fonction", arbre_fonctions, definition)
+        arbre_fonctions = Noeud2(OP_FONCTION, arbre_fonctions, definition)
 
     # Chaîne "inst" pour main
-    arbre_main: Any = "empty"
+    arbre_main: Any = None
     for instruction in reversed(instructions_main):
-        arbre_main = ("inst", instruction, arbre_main)
+        arbre_main = Noeud2(OP_INST, instruction, arbre_main)
 
     return arbre_fonctions, arbre_main
 
 
 def extraire_parametres_depuis_param_chain(noeud_parametres: Any) -> List[str]:
-    if noeud_parametres == "empty":
+    if noeud_parametres is None:
         return []
-    if not isinstance(noeud_parametres, tuple) or noeud_parametres[0] != "param":
+    if not isinstance(noeud_parametres, Noeud) or noeud_parametres.code != OP_PARAM:
         raise TypeError(f"Noeud paramètres invalide : {noeud_parametres!r}")
 
-    if len(noeud_parametres) == 2:
-        if not isinstance(noeud_parametres[1], str):
-            raise TypeError("Nom de paramètre invalide")
-        return [noeud_parametres[1]]
-
-    if len(noeud_parametres) == 3:
-        return extraire_parametres_depuis_param_chain(noeud_parametres[1]) + [noeud_parametres[2]]
+    if isinstance(noeud_parametres, Noeud2):
+        return extraire_parametres_depuis_param_chain(noeud_parametres.a) + [noeud_parametres.b]
 
-    raise TypeError("Structure de paramètres invalide")
+    if not isinstance(noeud_parametres.a, str):
+        raise TypeError("Nom de paramètre invalide")
+    return [noeud_parametres.a]
 
 
 def extraire_arguments_depuis_exp_chain(noeud_expressions: Any) -> List[Any]:
-    if noeud_expressions == "empty":
+    if noeud_expressions is None:
         return []
-    if not isinstance(noeud_expressions, tuple) or noeud_expressions[0] != "exp":
+    if not isinstance(noeud_expressions, Noeud) or noeud_expressions.code != OP_EXP:
         raise TypeError(f"Noeud arguments invalide : {noeud_expressions!r}")
 
-    if len(noeud_expressions) == 2:
-        return [noeud_expressions[1]]
-
-    if len(noeud_expressions) == 3:
-        return extraire_arguments_depuis_exp_chain(noeud_expressions[1]) + [noeud_expressions[2]]
+    if isinstance(noeud_expressions, Noeud2):
+        return extraire_arguments_depuis_exp_chain(noeud_expressions.a) + [noeud_expressions.b]
 
-    raise TypeError("Structure d'arguments invalide")
+    return [noeud_expressions.a]
 
 
 def enregistrer_fonctions(arbre_fonctions: Any) -> None:
-    print("arbre_fonctions ",arbre_fonctions)
-    if arbre_fonctions == "empty":
+    print("arbre_fonctions ", vers_tuple(arbre_fonctions))
+    if arbre_fonctions is None:
         return
-    if not isinstance(arbre_fonctions, tuple) or arbre_fonctions[0] != "fonction":
+    if not isinstance(arbre_fonctions, Noeud) or arbre_fonctions.code != OP_FONCTION:
         return
 
-    enregistrer_fonctions(arbre_fonctions[1])
+    enregistrer_fonctions(arbre_fonctions.a)
 
-    definition = arbre_fonctions[2]
-    if definition == "empty":
-        return
+    definition = arbre_fonctions.b
     if not est_definition_fonction(definition):
         return
 
-    nom_fonction, noeud_parametres, corps = definition
-    fonctions[nom_fonction] = (noeud_parametres, corps)
+    fonctions[definition.a] = Fonction(definition.b, definition.c)
 
 # ---------------------------------------------------------------------------
-# Evaluation de l'arbre
+# Evaluation de l'arbre : une table de gestionnaires indexée par code d'opération
 # ---------------------------------------------------------------------------
 
 
 def executer_instruction(arbre: Any) -> None:
-    if arbre == "empty":
+    if arbre is None:
         return
 
-    if not isinstance(arbre, tuple):
+    if not isinstance(arbre, Noeud):
         raise TypeError(f"Instruction invalide : {arbre!r}")
 
-    etiquette = arbre[0]
+    gestionnaire = TABLE_INSTRUCTIONS[arbre.code]
+    if gestionnaire is None:
+        raise ValueError(f"Instruction inconnue : {ETIQUETTES[CODE_GENERIQUE[arbre.code]]!r}")
+    gestionnaire(arbre)
 
-    if etiquette == "PROG":
-        enregistrer_fonctions(arbre[1])
-        executer_instruction(arbre[2])
-        return
 
-    if etiquette == "main":
-        executer_instruction(arbre[1])
-        return
+def executer_prog(noeud: Noeud2) -> None:
+    enregistrer_fonctions(noeud.a)
+    if INLINING_ACTIF:
+        rapport = inliner_programme(noeud.b)
+        if AFFICHER_RAPPORT_INLINING:
+            for nom_fonction, nombre_sites in rapport.items():
+                print(f"inlining : {nom_fonction!r} remplacée sur {nombre_sites} site(s)")
+    if OPTIMISATION_BOUCLES_ACTIVE:
+        optimiser_boucles_programme(noeud.b)
+    executer_instruction(noeud.b)
 
-    if etiquette == "inst":
-        executer_instruction(arbre[1])
-        executer_instruction(arbre[2])
-        return
 
-    if etiquette == "print":
-        valeur = evaluer_expression(arbre[1])
-        print(f"{PREFIXE_CONSOLE}{valeur}")
-        return
+def executer_main(noeud: Noeud1) -> None:
+    executer_instruction(noeud.a)
 
-    if etiquette == "assign":
-        ecrire_variable(arbre[1], evaluer_expression(arbre[2]))
-        return
 
-    if etiquette == "if":
-        if evaluer_expression(arbre[1]):
-            executer_instruction(arbre[2])
-        else:
-            executer_instruction(arbre[3])
-        return
+def executer_inst(noeud: Noeud2) -> None:
+    # Chaîne 'inst' parcourue en boucle plutôt qu'en récursion
+    courant: Any = noeud
+    while courant is not None:
+        executer_instruction(courant.a)
+        courant = courant.b
 
-    if etiquette == "while":
-        while evaluer_expression(arbre[1]):
-            executer_instruction(arbre[2])
-        return
 
-    if etiquette == "for":
-        executer_instruction(arbre[1])
-        while evaluer_expression(arbre[2]):
-            executer_instruction(arbre[4])
-            executer_instruction(arbre[3])
-        return
+def afficher(valeur: Any) -> None:
+    print(f"{PREFIXE_CONSOLE}{valeur}")
 
-    if etiquette == "call":
-        evaluer_expression(arbre)
-        return
 
-    if etiquette == "callParam":
-        evaluer_expression(arbre)
-        return
+def executer_print(noeud: Noeud1) -> None:
+    afficher(evaluer_expression(noeud.a))
 
-    if etiquette == "return":
-        if arbre[1] == "empty":
-            raise SignalRetour(None)
-        raise SignalRetour(evaluer_expression(arbre[1]))
 
-    if etiquette == "++":
-        nom_variable = arbre[1]
-        ancienne_valeur = lire_variable(nom_variable)
-        ecrire_variable(nom_variable, ancienne_valeur + 1)
-        return
+def executer_assign(noeud: Noeud2) -> None:
+    ecrire_variable(noeud.a, evaluer_expression(noeud.b))
 
-    if etiquette == "push":
-        tab = lire_variable(arbre[1])
-        tab.append(evaluer_expression(arbre[2]))
-        return
 
-    if etiquette == "assign_index_tab":
-        tableau = lire_variable(arbre[1])
-        index = evaluer_expression(arbre[2])
-        valeur = evaluer_expression(arbre[3])
-        tableau[index] = valeur
-        return
-        
-    if etiquette == "pop_inst":
-        tableau = lire_variable(arbre[1])
-        tableau.pop()
-        return 
+def executer_if(noeud: Noeud3) -> None:
+    if evaluer_expression(noeud.a):
+        executer_instruction(noeud.b)
+    else:
+        executer_instruction(noeud.c)
+
+
+def executer_while(noeud: Noeud2) -> None:
+    while evaluer_expression(noeud.a):
+        executer_instruction(noeud.b)
+
+
+def executer_for(noeud: Noeud4) -> None:
+    # ('for', init, condition, increment, corps_inst)
+    executer_instruction(noeud.a)
+    while evaluer_expression(noeud.b):
+        executer_instruction(noeud.d)
+        executer_instruction(noeud.c)
+
+
+def executer_appel(noeud: Noeud1) -> None:
+    evaluer_expression(noeud)
+
+
+def executer_return(noeud: Noeud1) -> None:
+    if noeud.a is None:
+        raise SignalRetour(None)
+    raise SignalRetour(evaluer_expression(noeud.a))
+
+
+def executer_increment(noeud: Noeud1) -> None:
+    nom_variable = noeud.a
+    ancienne_valeur = lire_variable(nom_variable)
+    ecrire_variable(nom_variable, ancienne_valeur + 1)
 
-    # Une définition de fonction dans main ne s'exécute pas ici (elles sont enregistrées au départ)
-    if est_definition_fonction(arbre):
-        return
 
-    raise ValueError(f"Instruction inconnue : {etiquette!r}")
+def executer_push(noeud: Noeud2) -> None:
+    tab = lire_variable(noeud.a)
+    tab.append(evaluer_expression(noeud.b))
+
+
+def executer_assign_index_tab(noeud: Noeud3) -> None:
+    tableau = lire_variable(noeud.a)
+    index = evaluer_expression(noeud.b)
+    valeur = evaluer_expression(noeud.c)
+    tableau[index] = valeur
+
+
+def executer_pop_inst(noeud: Noeud1) -> None:
+    tableau = lire_variable(noeud.a)
+    tableau.pop()
+
+
+def executer_del(noeud: Noeud2) -> None:
+    conteneur = lire_variable(noeud.a)
+    supprimer_element(noeud.a, conteneur, evaluer_expression(noeud.b))
+
+
+def supprimer_element(nom_conteneur: str, conteneur: Any, cle: Any) -> None:
+    try:
+        del conteneur[cle]
+    except KeyError:
+        print(f"{PREFIXE_CONSOLE}Erreur: clé {cle} absente du dictionnaire '{nom_conteneur}'")
+    except IndexError:
+        print(f"{PREFIXE_CONSOLE}Erreur: index {cle} est hors limites du tableau '{nom_conteneur}'")
+
+
+def executer_for_in(noeud: Noeud3) -> None:
+    # Parcours d'une copie : le corps peut modifier le conteneur sans casser la boucle
+    for element in list(evaluer_expression(noeud.b)):
+        ecrire_variable(noeud.a, element)
+        executer_instruction(noeud.c)
+
+
+def executer_definition(noeud: Noeud3) -> None:
+    # Une définition de fonction dans main ne s'exécute pas ici (elles sont enregistrées au départ)
+    return
 
 
 def evaluer_expression(arbre: Any) -> Any:
+    if isinstance(arbre, Noeud):
+        gestionnaire = TABLE_EXPRESSIONS[arbre.code]
+        if gestionnaire is None:
+            raise ValueError(f"Expression inconnue : {ETIQUETTES[CODE_GENERIQUE[arbre.code]]!r}")
+        return gestionnaire(arbre)
     if isinstance(arbre, int):
         return arbre
-    if isinstance(arbre, bool):
-        return arbre
     if isinstance(arbre, str):
         return lire_variable(arbre)
 
-    if not isinstance(arbre, tuple):
-        raise TypeError(f"Expression invalide : {arbre!r}")
+    raise TypeError(f"Expression invalide : {arbre!r}")
 
-    etiquette = arbre[0]
 
-    if etiquette == "+":
-        return evaluer_expression(arbre[1]) + evaluer_expression(arbre[2])
-    if etiquette == "-":
-        return evaluer_expression(arbre[1]) - evaluer_expression(arbre[2])
-    if etiquette == "*":
-        return evaluer_expression(arbre[1]) * evaluer_expression(arbre[2])
-    if etiquette == "/":
-        return evaluer_expression(arbre[1]) / evaluer_expression(arbre[2])
-
-    if etiquette == "and":
-        return bool(evaluer_expression(arbre[1])) and bool(evaluer_expression(arbre[2]))
-    if etiquette == "or":
-        return bool(evaluer_expression(arbre[1])) or bool(evaluer_expression(arbre[2]))
-
-    if etiquette == "<":
-        return evaluer_expression(arbre[1]) < evaluer_expression(arbre[2])
-    if etiquette == "<=":
-        return evaluer_expression(arbre[1]) <= evaluer_expression(arbre[2])
-    if etiquette == "==":
-        return evaluer_expression(arbre[1]) == evaluer_expression(arbre[2])
-    if etiquette == ">":
-        return evaluer_expression(arbre[1]) > evaluer_expression(arbre[2])
-
-    if etiquette == "array":
-        if len(arbre) == 1:
-            return []
-        elements = extraire_arguments_depuis_exp_chain(arbre[1])
-        return elements
-
-    if etiquette == "index":
-        tableau = lire_variable(arbre[1])
-        index = evaluer_expression(arbre[2])
-        try:
-            return tableau[index]
-        except IndexError:
-            print(f"{PREFIXE_CONSOLE}Erreur: index {index} est hors limites du tableau '{arbre[1]}'")
-            return None
+# -----------------------
+# Caches en ligne (quickening) : chaque NoeudOperation compte les observations
+# consécutives des types attendus (int/int, ou list/int pour index). Au seuil,
+# son code est réécrit en place vers la version spécialisée ; la garde de
+# celle-ci rend le site au chemin générique dès que les types changent.
+# -----------------------
+
+SEUIL_SPECIALISATION = 16
+
+
+def observer_operandes(noeud: NoeudOperation, gauche: Any, droite: Any) -> None:
+    # Site déjà générique pour de bon, ou spécialisé par un appel récursif imbriqué
+    if noeud.compteur < 0 or noeud.code not in SPECIALISATION:
+        return
+    type_gauche, type_droite = TYPES_SPECIALISES[noeud.code]
+    if type(gauche) is type_gauche and type(droite) is type_droite:
+        noeud.compteur += 1
+        if noeud.compteur >= SEUIL_SPECIALISATION:
+            noeud.code = SPECIALISATION[noeud.code]
+    else:
+        noeud.compteur = 0
+
+
+def evaluer_operande(arbre: Any) -> Any:
+    # Chemin court des versions spécialisées : les feuilles (nom, nombre) et les
+    # sous-nœuds sont évalués sans repasser par les tests de evaluer_expression.
+    type_arbre = type(arbre)
+    if type_arbre is str:
+        for contexte in reversed(pile_des_contextes):
+            if arbre in contexte:
+                return contexte[arbre]
+        return lire_variable(arbre)
+    if type_arbre is int:
+        return arbre
+    return evaluer_expression(arbre)
+
+
+def despecialiser(noeud: NoeudOperation) -> None:
+    # Garde échouée : retour définitif au générique (pas d'oscillation)
+    noeud.code = CODE_GENERIQUE[noeud.code]
+    noeud.compteur = -1
+
+
+def evaluer_plus(noeud: NoeudOperation) -> Any:
+    gauche = evaluer_expression(noeud.a)
+    droite = evaluer_expression(noeud.b)
+    observer_operandes(noeud, gauche, droite)
+    return gauche + droite
+
+
+def evaluer_plus_entiers(noeud: NoeudOperation) -> Any:
+    gauche = evaluer_operande(noeud.a)
+    droite = evaluer_operande(noeud.b)
+    if type(gauche) is not int or type(droite) is not int:
+        despecialiser(noeud)
+    return gauche + droite
+
+
+def evaluer_moins(noeud: NoeudOperation) -> Any:
+    gauche = evaluer_expression(noeud.a)
+    droite = evaluer_expression(noeud.b)
+    observer_operandes(noeud, gauche, droite)
+    return gauche - droite
+
+
+def evaluer_moins_entiers(noeud: NoeudOperation) -> Any:
+    gauche = evaluer_operande(noeud.a)
+    droite = evaluer_operande(noeud.b)
+    if type(gauche) is not int or type(droite) is not int:
+        despecialiser(noeud)
+    return gauche - droite
+
+
+def evaluer_fois(noeud: NoeudOperation) -> Any:
+    gauche = evaluer_expression(noeud.a)
+    droite = evaluer_expression(noeud.b)
+    observer_operandes(noeud, gauche, droite)
+    return gauche * droite
 
-    if etiquette == "pop_exp":
-        tableau = lire_variable(arbre[1])
-        return tableau.pop()
 
-    if etiquette == "len":
-        tableau = lire_variable(arbre[1])
-        return len(tableau)
+def evaluer_fois_entiers(noeud: NoeudOperation) -> Any:
+    gauche = evaluer_operande(noeud.a)
+    droite = evaluer_operande(noeud.b)
+    if type(gauche) is not int or type(droite) is not int:
+        despecialiser(noeud)
+    return gauche * droite
 
 
-    if etiquette == "call":
-        nom_fonction = arbre[1]
-        if nom_fonction not in fonctions:
-            raise NameError(f"Fonction non définie : {nom_fonction!r}")
-        noeud_parametres, corps = fonctions[nom_fonction]
+def evaluer_divise(noeud: Noeud2) -> Any:
+    return evaluer_expression(noeud.a) / evaluer_expression(noeud.b)
 
-        # appel sans arguments
-        liste_parametres = extraire_parametres_depuis_param_chain(noeud_parametres)
-        if len(liste_parametres) != 0:
+
+def evaluer_et(noeud: Noeud2) -> Any:
+    return bool(evaluer_expression(noeud.a)) and bool(evaluer_expression(noeud.b))
+
+
+def evaluer_ou(noeud: Noeud2) -> Any:
+    return bool(evaluer_expression(noeud.a)) or bool(evaluer_expression(noeud.b))
+
+
+def evaluer_inf(noeud: NoeudOperation) -> Any:
+    gauche = evaluer_expression(noeud.a)
+    droite = evaluer_expression(noeud.b)
+    observer_operandes(noeud, gauche, droite)
+    return gauche < droite
+
+
+def evaluer_inf_entiers(noeud: NoeudOperation) -> Any:
+    gauche = evaluer_operande(noeud.a)
+    droite = evaluer_operande(noeud.b)
+    if type(gauche) is not int or type(droite) is not int:
+        despecialiser(noeud)
+    return gauche < droite
+
+
+def evaluer_inf_egal(noeud: NoeudOperation) -> Any:
+    gauche = evaluer_expression(noeud.a)
+    droite = evaluer_expression(noeud.b)
+    observer_operandes(noeud, gauche, droite)
+    return gauche <= droite
+
+
+def evaluer_inf_egal_entiers(noeud: NoeudOperation) -> Any:
+    gauche = evaluer_operande(noeud.a)
+    droite = evaluer_operande(noeud.b)
+    if type(gauche) is not int or type(droite) is not int:
+        despecialiser(noeud)
+    return gauche <= droite
+
+
+def evaluer_egal_egal(noeud: NoeudOperation) -> Any:
+    gauche = evaluer_expression(noeud.a)
+    droite = evaluer_expression(noeud.b)
+    observer_operandes(noeud, gauche, droite)
+    return gauche == droite
+
+
+def evaluer_egal_egal_entiers(noeud: NoeudOperation) -> Any:
+    gauche = evaluer_operande(noeud.a)
+    droite = evaluer_operande(noeud.b)
+    if type(gauche) is not int or type(droite) is not int:
+        despecialiser(noeud)
+    return gauche == droite
+
+
+def evaluer_sup(noeud: NoeudOperation) -> Any:
+    gauche = evaluer_expression(noeud.a)
+    droite = evaluer_expression(noeud.b)
+    observer_operandes(noeud, gauche, droite)
+    return gauche > droite
+
+
+def evaluer_sup_entiers(noeud: NoeudOperation) -> Any:
+    gauche = evaluer_operande(noeud.a)
+    droite = evaluer_operande(noeud.b)
+    if type(gauche) is not int or type(droite) is not int:
+        despecialiser(noeud)
+    return gauche > droite
+
+
+def evaluer_array(noeud: Noeud1) -> Any:
+    elements = extraire_arguments_depuis_exp_chain(noeud.a)
+    return elements
+
+
+def evaluer_index(noeud: NoeudOperation) -> Any:
+    tableau = lire_variable(noeud.a)
+    index = evaluer_expression(noeud.b)
+    observer_operandes(noeud, tableau, index)
+    return lire_element(noeud.a, tableau, index)
+
+
+def evaluer_index_liste_entier(noeud: NoeudOperation) -> Any:
+    tableau = lire_variable(noeud.a)
+    index = evaluer_operande(noeud.b)
+    if type(tableau) is list and type(index) is int and -len(tableau) <= index < len(tableau):
+        return tableau[index]
+    if type(tableau) is not list or type(index) is not int:
+        despecialiser(noeud)
+    return lire_element(noeud.a, tableau, index)
+
+
+def lire_element(nom_tableau: str, tableau: Any, index: Any) -> Any:
+    try:
+        return tableau[index]
+    except IndexError:
+        print(f"{PREFIXE_CONSOLE}Erreur: index {index} est hors limites du tableau '{nom_tableau}'")
+        return None
+    except KeyError:
+        print(f"{PREFIXE_CONSOLE}Erreur: clé {index} absente du dictionnaire '{nom_tableau}'")
+        return None
+
+
+def extraire_paires_depuis_paire_chain(noeud_paires: Any) -> List[Tuple[Any, Any]]:
+    if noeud_paires is None:
+        return []
+    if not isinstance(noeud_paires, Noeud) or noeud_paires.code != OP_PAIRE:
+        raise TypeError(f"Noeud paires invalide : {noeud_paires!r}")
+
+    if isinstance(noeud_paires, Noeud3):
+        return extraire_paires_depuis_paire_chain(noeud_paires.a) + [(noeud_paires.b, noeud_paires.c)]
+
+    return [(noeud_paires.a, noeud_paires.b)]
+
+
+def evaluer_map(noeud: Noeud1) -> Any:
+    # Table de hachage Python : lecture, écriture, appartenance et suppression en O(1)
+    dictionnaire: Dict[Any, Any] = {}
+    for cle, valeur in extraire_paires_depuis_paire_chain(noeud.a):
+        dictionnaire[evaluer_expression(cle)] = evaluer_expression(valeur)
+    return dictionnaire
+
+
+def evaluer_in(noeud: Noeud2) -> Any:
+    return evaluer_expression(noeud.a) in evaluer_expression(noeud.b)
+
+
+def evaluer_pop_exp(noeud: Noeud1) -> Any:
+    tableau = lire_variable(noeud.a)
+    return tableau.pop()
+
+
+def evaluer_len(noeud: Noeud1) -> Any:
+    tableau = lire_variable(noeud.a)
+    return len(tableau)
+
+
+def executer_corps_fonction(corps: Any, contexte_local: Dict[str, Any]) -> Any:
+    pile_des_contextes.append(contexte_local)
+    try:
+        executer_instruction(corps)
+    except SignalRetour as signal:
+        return signal.valeur
+    finally:
+        pile_des_contextes.pop()
+    return None
+
+
+def appeler_fonction(nom_fonction: str, valeurs_arguments: List[Any]) -> Any:
+    # Point d'entrée commun des appels (arbre et code compilé par le JIT)
+    fonction = fonctions.get(nom_fonction)
+    if fonction is None:
+        raise NameError(f"Fonction non définie : {nom_fonction!r}")
+
+    liste_parametres = fonction.parametres
+    if len(liste_parametres) != len(valeurs_arguments):
+        if not valeurs_arguments:
+            # appel sans arguments
             raise TypeError(f"Fonction {nom_fonction!r} n'attend pas de paramètre.")
-        pile_des_contextes.append({})
-        try:
-            executer_instruction(corps)
-        except SignalRetour as signal:
-            return signal.valeur
-        finally:
-            pile_des_contextes.pop()
+        raise TypeError(
+            f"Nombre d'arguments incorrect pour {nom_fonction!r} : "
+            f"attendu {len(liste_parametres)}, reçu {len(valeurs_arguments)}."
+        )
+
+    if fonction.compilee is None:
+        fonction.appels += 1
+        if JIT_ACTIF and fonction.compilable and fonction.appels >= SEUIL_JIT:
+            compiler_fonction(nom_fonction, fonction)
+    if fonction.compilee is not None:
+        return fonction.compilee(*valeurs_arguments)
+
+    contexte_local: Dict[str, Any] = {}
+    for nom_parametre, valeur in zip(liste_parametres, valeurs_arguments):
+        contexte_local[nom_parametre] = valeur
+
+    return executer_corps_fonction(fonction.corps, contexte_local)
+
+
+def evaluer_call(noeud: Noeud1) -> Any:
+    return appeler_fonction(noeud.a, [])
+
+
+def evaluer_call_param(noeud: Noeud2) -> Any:
+    nom_fonction = noeud.a
+    if nom_fonction not in fonctions:
+        raise NameError(f"Fonction non définie : {nom_fonction!r}")
+
+    liste_arguments_expressions = extraire_arguments_depuis_exp_chain(noeud.b)
+    valeurs_arguments = [evaluer_expression(expression) for expression in liste_arguments_expressions]
+    return appeler_fonction(nom_fonction, valeurs_arguments)
+
+
+# Tables de dispatch : code d'opération -> gestionnaire (None = interdit à cette place)
+TABLE_INSTRUCTIONS: List[Optional[Callable[[Any], None]]] = [None] * NB_CODES
+TABLE_INSTRUCTIONS[OP_PROG] = executer_prog
+TABLE_INSTRUCTIONS[OP_MAIN] = executer_main
+TABLE_INSTRUCTIONS[OP_INST] = executer_inst
+TABLE_INSTRUCTIONS[OP_PRINT] = executer_print
+TABLE_INSTRUCTIONS[OP_ASSIGN] = executer_assign
+TABLE_INSTRUCTIONS[OP_IF] = executer_if
+TABLE_INSTRUCTIONS[OP_WHILE] = executer_while
+TABLE_INSTRUCTIONS[OP_FOR] = executer_for
+TABLE_INSTRUCTIONS[OP_CALL] = executer_appel
+TABLE_INSTRUCTIONS[OP_CALL_PARAM] = executer_appel
+TABLE_INSTRUCTIONS[OP_RETURN] = executer_return
+TABLE_INSTRUCTIONS[OP_INCREMENT] = executer_increment
+TABLE_INSTRUCTIONS[OP_PUSH] = executer_push
+TABLE_INSTRUCTIONS[OP_ASSIGN_INDEX_TAB] = executer_assign_index_tab
+TABLE_INSTRUCTIONS[OP_POP_INST] = executer_pop_inst
+TABLE_INSTRUCTIONS[OP_DEFINITION] = executer_definition
+TABLE_INSTRUCTIONS[OP_DEL] = executer_del
+TABLE_INSTRUCTIONS[OP_FOR_IN] = executer_for_in
+
+TABLE_EXPRESSIONS: List[Optional[Callable[[Any], Any]]] = [None] * NB_CODES
+TABLE_EXPRESSIONS[OP_PLUS] = evaluer_plus
+TABLE_EXPRESSIONS[OP_MOINS] = evaluer_moins
+TABLE_EXPRESSIONS[OP_FOIS] = evaluer_fois
+TABLE_EXPRESSIONS[OP_DIVISE] = evaluer_divise
+TABLE_EXPRESSIONS[OP_ET] = evaluer_et
+TABLE_EXPRESSIONS[OP_OU] = evaluer_ou
+TABLE_EXPRESSIONS[OP_INF] = evaluer_inf
+TABLE_EXPRESSIONS[OP_INF_EGAL] = evaluer_inf_egal
+TABLE_EXPRESSIONS[OP_EGAL_EGAL] = evaluer_egal_egal
+TABLE_EXPRESSIONS[OP_SUP] = evaluer_sup
+TABLE_EXPRESSIONS[OP_ARRAY] = evaluer_array
+TABLE_EXPRESSIONS[OP_INDEX] = evaluer_index
+TABLE_EXPRESSIONS[OP_POP_EXP] = evaluer_pop_exp
+TABLE_EXPRESSIONS[OP_LEN] = evaluer_len
+TABLE_EXPRESSIONS[OP_CALL] = evaluer_call
+TABLE_EXPRESSIONS[OP_CALL_PARAM] = evaluer_call_param
+TABLE_EXPRESSIONS[OP_MAP] = evaluer_map
+TABLE_EXPRESSIONS[OP_IN] = evaluer_in
+
+TABLE_EXPRESSIONS[OP_PLUS_ENTIERS] = evaluer_plus_entiers
+TABLE_EXPRESSIONS[OP_MOINS_ENTIERS] = evaluer_moins_entiers
+TABLE_EXPRESSIONS[OP_FOIS_ENTIERS] = evaluer_fois_entiers
+TABLE_EXPRESSIONS[OP_INF_ENTIERS] = evaluer_inf_entiers
+TABLE_EXPRESSIONS[OP_INF_EGAL_ENTIERS] = evaluer_inf_egal_entiers
+TABLE_EXPRESSIONS[OP_SUP_ENTIERS] = evaluer_sup_entiers
+TABLE_EXPRESSIONS[OP_EGAL_EGAL_ENTIERS] = evaluer_egal_egal_entiers
+TABLE_EXPRESSIONS[OP_INDEX_LISTE_ENTIER] = evaluer_index_liste_entier
+
+
+# ---------------------------------------------------------------------------
+# Inlining des petites fonctions
+#
+# Une fonction est inlinable si son corps est un unique 'return expression',
+# sans appel (donc non récursive), pop ni tableau littéral, et d'au plus
+# TAILLE_MAX_INLINING nœuds. Chaque appel en position d'expression est remplacé par une copie de
+# l'expression où les paramètres sont renommés en les arguments (substitution
+# simultanée). Le corps n'écrit aucune variable : avec la recherche dynamique
+# de lire_variable, les noms libres se résolvent alors exactement comme pendant
+# l'appel. Seuls les arguments sans effet (pas d'appel, pop, index ni tableau
+# ou dictionnaire littéral) sont substitués. Pour garder les erreurs levées par
+# les arguments (division par zéro, variable non initialisée) et leur ordre,
+# chaque paramètre doit être lu exactement une fois, dans l'ordre des
+# paramètres et hors d'un '&' ou '|' ; sinon seuls des entiers littéraux sont
+# acceptés comme arguments. Un paramètre indexé (t[i]) bloque l'inlining : le
+# message d'erreur d'un index hors limites doit garder le nom 't'.
+# ---------------------------------------------------------------------------
+
+NOMS_SLOTS = ("a", "b", "c", "d")
+CODES_APPEL = {OP_CALL, OP_CALL_PARAM, OP_MAP_TAB, OP_REDUCE_TAB}
+CODES_AVEC_EFFET = CODES_APPEL | {OP_POP_EXP}
+
+
+class InliningImpossible(Exception):
+    pass
+
+
+def taille_expression(arbre: Any) -> int:
+    if not isinstance(arbre, Noeud):
+        return 1
+    return 1 + sum(taille_expression(enfant) for enfant in arbre.enfants())
+
+
+def contient_code(arbre: Any, codes: Any) -> bool:
+    if not isinstance(arbre, Noeud):
+        return False
+    if CODE_GENERIQUE[arbre.code] in codes:
+        return True
+    return any(contient_code(enfant, codes) for enfant in arbre.enfants())
+
+
+def fonction_inlinable(nom_fonction: str) -> Optional[Tuple[List[str], Any]]:
+    corps = fonctions[nom_fonction].corps
+    if not (isinstance(corps, Noeud) and corps.code == OP_INST and corps.b is None):
         return None
+    instruction = corps.a
+    if not (isinstance(instruction, Noeud) and instruction.code == OP_RETURN and instruction.a is not None):
+        return None
+    expression = instruction.a
+    if taille_expression(expression) > TAILLE_MAX_INLINING or contient_code(expression, CODES_AVEC_EFFET):
+        return None
+    if contient_code(expression, {OP_ARRAY}):
+        return None  # les éléments d'un tableau littéral ne sont pas évalués : pas de renommage possible
+    return fonctions[nom_fonction].parametres, expression
+
+
+def substituer(arbre: Any, substitutions: Dict[str, Any]) -> Any:
+    # Copie de l'expression (nouveaux nœuds, donc caches en ligne neufs)
+    if isinstance(arbre, str):
+        if arbre in substitutions:
+            return substituer(substitutions[arbre], {})
+        return arbre
+    if not isinstance(arbre, Noeud):
+        return arbre
+
+    code = CODE_GENERIQUE[arbre.code]
+    enfants = list(arbre.enfants())
+    debut = 0
+    if code in (OP_INDEX, OP_LEN):
+        # Position qui exige un nom de tableau, pas une expression
+        nom = enfants[0]
+        if nom in substitutions:
+            if not isinstance(substitutions[nom], str):
+                raise InliningImpossible(nom)
+            if code == OP_INDEX:
+                raise InliningImpossible(nom)  # le message « hors limites du tableau » cite le nom du paramètre
+            enfants[0] = substitutions[nom]
+        debut = 1
+    for position in range(debut, len(enfants)):
+        enfants[position] = substituer(enfants[position], substitutions)
+    return creer_noeud(code, *enfants)
+
+
+def lectures_parametres(arbre: Any, parametres: List[str], lectures: List[str]) -> bool:
+    # Paramètres lus dans l'ordre d'évaluation ; False si l'un d'eux est sous un '&' ou un '|'
+    if isinstance(arbre, str):
+        if arbre in parametres:
+            lectures.append(arbre)
+        return True
+    if not isinstance(arbre, Noeud):
+        return True
+    if CODE_GENERIQUE[arbre.code] in (OP_ET, OP_OU):
+        lectures_court_circuit: List[str] = []
+        for enfant in arbre.enfants():
+            lectures_parametres(enfant, parametres, lectures_court_circuit)
+        return not lectures_court_circuit
+    return all(lectures_parametres(enfant, parametres, lectures) for enfant in arbre.enfants())
+
+
+def evaluation_preservee(liste_parametres: List[str], expression: Any) -> bool:
+    lectures: List[str] = []
+    return lectures_parametres(expression, liste_parametres, lectures) and lectures == liste_parametres
+
+
+def inliner_appel(appel: Noeud, candidats: Dict[str, Tuple[List[str], Any]]) -> Any:
+    nom_fonction = appel.a
+    if nom_fonction not in candidats:
+        return None
+    liste_parametres, expression = candidats[nom_fonction]
+    arguments = extraire_arguments_depuis_exp_chain(appel.b) if appel.code == OP_CALL_PARAM else []
+    if len(arguments) != len(liste_parametres):
+        return None  # l'erreur d'arité reste levée à l'exécution
+    for argument in arguments:
+        if contient_code(argument, CODES_AVEC_EFFET | {OP_INDEX, OP_ARRAY, OP_MAP}):
+            return None
+    if not evaluation_preservee(liste_parametres, expression):
+        if not all(type(argument) is int for argument in arguments):
+            return None
+    try:
+        return substituer(expression, dict(zip(liste_parametres, arguments)))
+    except InliningImpossible:
+        return None
+
+
+def inliner_arbre(arbre: Any, candidats: Dict[str, Tuple[List[str], Any]], rapport: Dict[str, int]) -> None:
+    if not isinstance(arbre, Noeud) or arbre.code == OP_ARRAY:
+        # Les éléments d'un tableau littéral sont conservés tels quels
+        return
+    for nom_slot in NOMS_SLOTS[:len(arbre.enfants())]:
+        enfant = getattr(arbre, nom_slot)
+        inliner_arbre(enfant, candidats, rapport)
+        if not (isinstance(enfant, Noeud) and enfant.code in (OP_CALL, OP_CALL_PARAM)):
+            continue
+        if arbre.code == OP_INST and nom_slot == "a":
+            continue  # appel utilisé comme instruction : valeur ignorée
+        remplacement = inliner_appel(enfant, candidats)
+        if remplacement is not None:
+            setattr(arbre, nom_slot, remplacement)
+            rapport[enfant.a] = rapport.get(enfant.a, 0) + 1
+
+
+def inliner_programme(arbre_main: Any) -> Dict[str, int]:
+    """Inline les petites fonctions dans main et dans le corps des fonctions ; renvoie {nom: nombre de sites}."""
+    candidats: Dict[str, Tuple[List[str], Any]] = {}
+    for nom_fonction in fonctions:
+        candidat = fonction_inlinable(nom_fonction)
+        if candidat is not None:
+            candidats[nom_fonction] = candidat
+
+    rapport: Dict[str, int] = {}
+    if not candidats:
+        return rapport
+    inliner_arbre(Noeud1(OP_MAIN, arbre_main), candidats, rapport)
+    for fonction in fonctions.values():
+        inliner_arbre(Noeud1(OP_MAIN, fonction.corps), candidats, rapport)
+    return rapport
+
+
+# ---------------------------------------------------------------------------
+# Optimisation des boucles : expressions invariantes et len.
+#
+# Dans un while / for sans appel de fonction, une sous-expression qui ne lit
+# que des constantes, des variables jamais écrites dans la boucle (assign, ++,
+# init / incrément du for, variable du for_in) et des len.t sur des conteneurs
+# ni réaffectés ni modifiés par push / pop / del / t[i] = v est remplacée par un NoeudInvariant. Sa valeur est
+# calculée à la première évaluation puis réutilisée jusqu'à la prochaine entrée
+# dans la boucle (le NoeudBoucle qui l'enveloppe remet les caches à zéro).
+# Si la boucle modifie un conteneur sur place, une variable non réaffectée peut
+# tout de même changer de valeur (t == u après push(t, 2)) : la valeur n'est
+# alors mise en cache que si toutes les variables lues contiennent un entier.
+# Seules les valeurs immuables sont gardées : t + u renvoie une liste neuve à
+# chaque tour, la partager créerait des alias entre les variables affectées.
+# Rien n'est évalué par anticipation, une erreur éventuelle survient au même
+# moment qu'avant. index, pop, tableaux littéraux et appels ne sont jamais
+# hissés (affichage d'erreur, effets, identité des listes).
+# ---------------------------------------------------------------------------
 
-    if etiquette == "callParam":
-        nom_fonction = arbre[1]
-        noeud_expressions = arbre[2]
+NON_CALCULE = object()
+TYPES_IMMUABLES = (int, float, bool)
 
-        if nom_fonction not in fonctions:
-            raise NameError(f"Fonction non définie : {nom_fonction!r}")
+CODES_HISSABLES = {
+    OP_PLUS, OP_MOINS, OP_FOIS, OP_DIVISE,
+    OP_INF, OP_INF_EGAL, OP_SUP, OP_EGAL_EGAL, OP_ET, OP_OU,
+}
+CODES_MUTATION_LONGUEUR = {OP_PUSH, OP_POP_INST, OP_POP_EXP, OP_DEL, OP_ASSIGN_INDEX_TAB}
+
+
+class NoeudInvariant(Noeud1):
+    # noms_entiers : variables qui doivent contenir un entier pour que la valeur soit gardée
+    __slots__ = ("valeur", "noms_entiers")
+
+    def __init__(self, a: Any, noms_entiers: Tuple[str, ...] = ()):
+        self.code = OP_INVARIANT
+        self.a = a
+        self.valeur = NON_CALCULE
+        self.noms_entiers = noms_entiers
+
+
+class NoeudBoucle(Noeud2):
+    # a : la boucle d'origine, b : liste des NoeudInvariant à réinitialiser
+    def __init__(self, a: Any, b: List[NoeudInvariant]):
+        self.code = OP_BOUCLE_OPTIMISEE
+        self.a = a
+        self.b = b
 
-        noeud_parametres, corps = fonctions[nom_fonction]
-        liste_parametres = extraire_parametres_depuis_param_chain(noeud_parametres)
-        liste_arguments_expressions = extraire_arguments_depuis_exp_chain(noeud_expressions)
-        valeurs_arguments = [evaluer_expression(expression) for expression in liste_arguments_expressions]
 
-        if len(liste_parametres) != len(valeurs_arguments):
-            raise TypeError(
-                f"Nombre d'arguments incorrect pour {nom_fonction!r} : "
-                f"attendu {len(liste_parametres)}, reçu {len(valeurs_arguments)}."
-            )
+def executer_boucle_optimisee(noeud: NoeudBoucle) -> None:
+    for invariant in noeud.b:
+        invariant.valeur = NON_CALCULE
+    executer_instruction(noeud.a)
 
-        contexte_local: Dict[str, Any] = {}
-        for nom_parametre, valeur in zip(liste_parametres, valeurs_arguments):
-            contexte_local[nom_parametre] = valeur
 
-        pile_des_contextes.append(contexte_local)
-        try:
-            executer_instruction(corps)
-        except SignalRetour as signal:
-            return signal.valeur
-        finally:
-            pile_des_contextes.pop()
+def evaluer_invariant(noeud: NoeudInvariant) -> Any:
+    valeur = noeud.valeur
+    if valeur is NON_CALCULE:
+        valeur = evaluer_expression(noeud.a)
+        if type(valeur) in TYPES_IMMUABLES and all(type(lire_variable(nom)) is int for nom in noeud.noms_entiers):
+            noeud.valeur = valeur
+    return valeur
 
+
+def variables_ecrites(arbre: Any, ecrites: set) -> None:
+    if not isinstance(arbre, Noeud) or arbre.code == OP_INVARIANT:
+        return
+    if arbre.code in (OP_ASSIGN, OP_INCREMENT, OP_FOR_IN):
+        ecrites.add(arbre.a)
+    for enfant in arbre.enfants():
+        variables_ecrites(enfant, ecrites)
+
+
+def est_invariant(arbre: Any, ecrites: set, longueurs_stables: bool) -> bool:
+    if isinstance(arbre, int):
+        return True
+    if isinstance(arbre, str):
+        return arbre not in ecrites
+    if not isinstance(arbre, Noeud):
+        return False
+    code = CODE_GENERIQUE[arbre.code]
+    if code == OP_INVARIANT:
+        return True
+    if code == OP_LEN:
+        return longueurs_stables and arbre.a not in ecrites
+    if code in CODES_HISSABLES:
+        return est_invariant(arbre.a, ecrites, longueurs_stables) and est_invariant(arbre.b, ecrites, longueurs_stables)
+    return False
+
+
+def hisser_expression(parent: Noeud, nom_slot: str, ecrites: set, longueurs_stables: bool, invariants: List[NoeudInvariant]) -> None:
+    expression = getattr(parent, nom_slot)
+    if not isinstance(expression, Noeud) or expression.code == OP_INVARIANT:
+        return
+    if est_invariant(expression, ecrites, longueurs_stables):
+        noms: set = set()
+        if not longueurs_stables:
+            noms_lus(expression, noms)
+        invariant = NoeudInvariant(expression, tuple(sorted(noms)))
+        setattr(parent, nom_slot, invariant)
+        invariants.append(invariant)
+        return
+    code = CODE_GENERIQUE[expression.code]
+    if code in CODES_HISSABLES:
+        hisser_expression(expression, "a", ecrites, longueurs_stables, invariants)
+        hisser_expression(expression, "b", ecrites, longueurs_stables, invariants)
+    elif code == OP_INDEX:
+        hisser_expression(expression, "b", ecrites, longueurs_stables, invariants)
+
+
+# Emplacements d'expressions dans chaque instruction (les autres sont des noms ou des instructions)
+SLOTS_EXPRESSIONS: Dict[int, Tuple[str, ...]] = {
+    OP_PRINT: ("a",),
+    OP_ASSIGN: ("b",),
+    OP_IF: ("a",),
+    OP_WHILE: ("a",),
+    OP_FOR: ("b",),
+    OP_RETURN: ("a",),
+    OP_PUSH: ("b",),
+    OP_ASSIGN_INDEX_TAB: ("b", "c"),
+    OP_DEL: ("b",),
+}
+
+
+def hisser_instruction(arbre: Any, ecrites: set, longueurs_stables: bool, invariants: List[NoeudInvariant]) -> None:
+    if not isinstance(arbre, Noeud):
+        return
+    for nom_slot in SLOTS_EXPRESSIONS.get(arbre.code, ()):
+        hisser_expression(arbre, nom_slot, ecrites, longueurs_stables, invariants)
+    if arbre.code in (OP_INST, OP_IF, OP_WHILE, OP_FOR, OP_FOR_IN, OP_BOUCLE_OPTIMISEE):
+        for enfant in arbre.enfants():
+            if isinstance(enfant, Noeud):
+                hisser_instruction(enfant, ecrites, longueurs_stables, invariants)
+
+
+def optimiser_boucle(boucle: Noeud) -> List[NoeudInvariant]:
+    invariants: List[NoeudInvariant] = []
+    if contient_code(boucle, CODES_APPEL):
+        return invariants  # une fonction appelée pourrait modifier ce qu'on croit invariant
+    ecrites: set = set()
+    variables_ecrites(boucle, ecrites)
+    longueurs_stables = not contient_code(boucle, CODES_MUTATION_LONGUEUR)
+    hisser_instruction(boucle, ecrites, longueurs_stables, invariants)
+    return invariants
+
+
+def optimiser_boucles(arbre: Any) -> None:
+    # Parcours des instructions ; la boucle externe est traitée avant les boucles internes
+    if not isinstance(arbre, Noeud):
+        return
+    if arbre.code == OP_INST:
+        instruction = arbre.a
+        if isinstance(instruction, Noeud) and instruction.code in (OP_WHILE, OP_FOR, OP_FOR_IN):
+            invariants = optimiser_boucle(instruction)
+            if invariants:
+                arbre.a = NoeudBoucle(instruction, invariants)
+        optimiser_boucles(instruction)
+        optimiser_boucles(arbre.b)
+        return
+    if arbre.code in (OP_MAIN, OP_IF, OP_WHILE, OP_FOR, OP_FOR_IN, OP_BOUCLE_OPTIMISEE):
+        for enfant in arbre.enfants():
+            optimiser_boucles(enfant)
+
+
+def optimiser_boucles_programme(arbre_main: Any) -> None:
+    optimiser_boucles(arbre_main)
+    for fonction in fonctions.values():
+        optimiser_boucles(fonction.corps)
+
+
+TABLE_INSTRUCTIONS[OP_BOUCLE_OPTIMISEE] = executer_boucle_optimisee
+TABLE_EXPRESSIONS[OP_INVARIANT] = evaluer_invariant
+
+
+# ---------------------------------------------------------------------------
+# JIT : traduction des fonctions chaudes en Python
+#
+# appeler_fonction compte les appels de chaque Fonction ; au SEUIL_JIT-ième,
+# le corps (déjà inliné / optimisé) est traduit en une fonction Python puis
+# compilé avec compile(). Paramètres et variables écrites deviennent des
+# variables locales Python, while / for / for_in des boucles natives et return
+# un return natif ; aucun contexte n'est empilé.
+#
+# La portée est dynamique : une variable écrite mais pas forcément affectée
+# avant sa première lecture est initialisée à NON_DEFINI et sa lecture retombe
+# sur lire_variable (contextes des appelants), comme dans l'arbre. Une fonction
+# dont un appelé (même indirect) peut lire l'une de ses variables locales
+# n'est pas traduite, ni celle qui contient un nœud non pris en charge : elle
+# reste définitivement interprétée par l'arbre.
+# ---------------------------------------------------------------------------
+
+NON_DEFINI = object()
+
+OPERATEURS_PYTHON: Dict[int, str] = {
+    OP_PLUS: "+", OP_MOINS: "-", OP_FOIS: "*", OP_DIVISE: "/",
+    OP_INF: "<", OP_INF_EGAL: "<=", OP_SUP: ">", OP_EGAL_EGAL: "==", OP_IN: "in",
+}
+
+
+class TraductionImpossible(Exception):
+    pass
+
+
+def noms_lus(arbre: Any, noms: set) -> None:
+    # Noms de variables lus : feuilles, tableaux de index / len / pop / push / del / t[i] = v, ++
+    if isinstance(arbre, str):
+        noms.add(arbre)
+        return
+    if not isinstance(arbre, Noeud):
+        return
+    code = CODE_GENERIQUE[arbre.code]
+    if code in (OP_CALL, OP_CALL_PARAM):
+        if code == OP_CALL_PARAM:
+            noms_lus(arbre.b, noms)
+        return
+    if code in (OP_MAP_TAB, OP_REDUCE_TAB):
+        for enfant in arbre.enfants()[1:]:  # le premier enfant est un nom de fonction
+            noms_lus(enfant, noms)
+        return
+    if code in (OP_ARRAY, OP_DEFINITION):
+        return  # éléments de tableau littéral non évalués, définition non exécutée
+    enfants = arbre.enfants()
+    if code in (OP_ASSIGN, OP_FOR_IN):
+        enfants = enfants[1:]  # variable seulement écrite
+    for enfant in enfants:
+        noms_lus(enfant, noms)
+
+
+def fonctions_appelees(arbre: Any, noms: set) -> None:
+    if not isinstance(arbre, Noeud):
+        return
+    if arbre.code in CODES_APPEL:
+        noms.add(arbre.a)
+    for enfant in arbre.enfants():
+        fonctions_appelees(enfant, noms)
+
+
+def variables_libres(nom_fonction: str) -> set:
+    # Noms qu'une fonction, ou une fonction qu'elle appelle, peut lire chez l'appelant
+    libres: set = set()
+    visitees: set = set()
+    a_visiter = [nom_fonction]
+    while a_visiter:
+        nom = a_visiter.pop()
+        if nom in visitees or nom not in fonctions:
+            continue
+        visitees.add(nom)
+        fonction = fonctions[nom]
+        lus: set = set()
+        noms_lus(fonction.corps, lus)
+        libres |= lus - variables_sures(fonction)
+        appelees: set = set()
+        fonctions_appelees(fonction.corps, appelees)
+        a_visiter.extend(appelees)
+    return libres
+
+
+def variables_sures(fonction: Fonction) -> set:
+    # Variables affectées au premier niveau du corps avant toute autre mention
+    sures = set(fonction.parametres)
+    mentionnees = set(fonction.parametres)
+    for instruction in liste_instructions_vers_liste_python(fonction.corps):
+        affectation = instruction
+        if isinstance(affectation, Noeud) and affectation.code == OP_BOUCLE_OPTIMISEE:
+            affectation = affectation.a
+        if isinstance(affectation, Noeud) and affectation.code == OP_FOR:
+            affectation = affectation.a  # l'initialisation s'exécute en premier
+        if isinstance(affectation, Noeud) and affectation.code == OP_ASSIGN and affectation.a not in mentionnees:
+            lus: set = set()
+            noms_lus(affectation.b, lus)
+            if affectation.a not in lus:
+                sures.add(affectation.a)
+        noms_lus(instruction, mentionnees)
+        variables_ecrites(instruction, mentionnees)
+    return sures
+
+
+class TraducteurPython:
+    """Traduit le corps d'une Fonction en source Python (variables préfixées par v_)."""
+
+    def __init__(self, nom_fonction: str, fonction: Fonction):
+        self.nom_fonction = nom_fonction
+        self.fonction = fonction
+        self.lignes: List[str] = []
+        self.temporaires = 0
+        self.locales: set = set(fonction.parametres)
+        variables_ecrites(fonction.corps, self.locales)
+        self.sures = variables_sures(fonction)
+
+    def traduire(self) -> str:
+        appelees: set = set()
+        fonctions_appelees(self.fonction.corps, appelees)
+        for nom_appelee in appelees:
+            if variables_libres(nom_appelee) & self.locales:
+                raise TraductionImpossible(f"{nom_appelee!r} lit une variable locale de l'appelant")
+
+        parametres = ", ".join(f"v_{nom}" for nom in self.fonction.parametres)
+        self.lignes.append(f"def jit_{self.nom_fonction}({parametres}):")
+        for nom in sorted(self.locales - self.sures):
+            self.lignes.append(f"    v_{nom} = NON_DEFINI")
+        self.bloc(self.fonction.corps, 1)
+        self.lignes.append("    return None")
+        return "\n".join(self.lignes) + "\n"
+
+    def lire(self, nom: str) -> str:
+        if nom in self.sures:
+            return f"v_{nom}"
+        if nom in self.locales:
+            return f"(v_{nom} if v_{nom} is not NON_DEFINI else lire_variable({nom!r}))"
+        return f"lire_variable({nom!r})"
+
+    def temporaire(self) -> str:
+        self.temporaires += 1
+        return f"t_{self.temporaires}"
+
+    def ecrire(self, niveau: int, ligne: str) -> None:
+        self.lignes.append("    " * niveau + ligne)
+
+    def bloc(self, arbre: Any, niveau: int) -> None:
+        nombre_lignes = len(self.lignes)
+        self.instruction(arbre, niveau)
+        if len(self.lignes) == nombre_lignes:
+            self.ecrire(niveau, "pass")
+
+    def instruction(self, arbre: Any, niveau: int) -> None:
+        if arbre is None:
+            return
+        if not isinstance(arbre, Noeud):
+            raise TraductionImpossible(repr(arbre))
+        code = arbre.code
+
+        if code == OP_INST:
+            for instruction in liste_instructions_vers_liste_python(arbre):
+                self.instruction(instruction, niveau)
+        elif code == OP_BOUCLE_OPTIMISEE:
+            self.instruction(arbre.a, niveau)
+        elif code == OP_PRINT:
+            self.ecrire(niveau, f"afficher({self.expression(arbre.a)})")
+        elif code == OP_ASSIGN:
+            self.ecrire(niveau, f"v_{arbre.a} = {self.expression(arbre.b)}")
+        elif code == OP_INCREMENT:
+            self.ecrire(niveau, f"v_{arbre.a} = {self.lire(arbre.a)} + 1")
+        elif code == OP_PUSH:
+            self.ecrire(niveau, f"{self.lire(arbre.a)}.append({self.expression(arbre.b)})")
+        elif code == OP_POP_INST:
+            self.ecrire(niveau, f"{self.lire(arbre.a)}.pop()")
+        elif code == OP_ASSIGN_INDEX_TAB:
+            # même ordre que l'arbre : tableau, index, puis valeur
+            tableau, index = self.temporaire(), self.temporaire()
+            self.ecrire(niveau, f"{tableau} = {self.lire(arbre.a)}")
+            self.ecrire(niveau, f"{index} = {self.expression(arbre.b)}")
+            self.ecrire(niveau, f"{tableau}[{index}] = {self.expression(arbre.c)}")
+        elif code == OP_DEL:
+            self.ecrire(niveau, f"supprimer_element({arbre.a!r}, {self.lire(arbre.a)}, {self.expression(arbre.b)})")
+        elif code == OP_IF:
+            self.ecrire(niveau, f"if {self.expression(arbre.a)}:")
+            self.bloc(arbre.b, niveau + 1)
+            if arbre.c is not None:
+                self.ecrire(niveau, "else:")
+                self.bloc(arbre.c, niveau + 1)
+        elif code == OP_WHILE:
+            self.ecrire(niveau, f"while {self.expression(arbre.a)}:")
+            self.bloc(arbre.b, niveau + 1)
+        elif code == OP_FOR:
+            self.instruction(arbre.a, niveau)
+            self.ecrire(niveau, f"while {self.expression(arbre.b)}:")
+            self.bloc(arbre.d, niveau + 1)
+            self.instruction(arbre.c, niveau + 1)
+        elif code == OP_FOR_IN:
+            self.ecrire(niveau, f"for v_{arbre.a} in list({self.expression(arbre.b)}):")
+            self.bloc(arbre.c, niveau + 1)
+        elif code == OP_RETURN:
+            valeur = "None" if arbre.a is None else self.expression(arbre.a)
+            self.ecrire(niveau, f"return {valeur}")
+        elif code in (OP_CALL, OP_CALL_PARAM):
+            self.ecrire(niveau, self.expression(arbre))
+        elif code == OP_DEFINITION:
+            return
+        else:
+            raise TraductionImpossible(ETIQUETTES[CODE_GENERIQUE[code]])
+
+    def expression(self, arbre: Any) -> str:
+        if isinstance(arbre, int):
+            return repr(arbre)
+        if isinstance(arbre, str):
+            return self.lire(arbre)
+        if not isinstance(arbre, Noeud):
+            raise TraductionImpossible(repr(arbre))
+        code = CODE_GENERIQUE[arbre.code]
+
+        if code == OP_INVARIANT:
+            return self.expression(arbre.a)
+        if code in OPERATEURS_PYTHON:
+            return f"({self.expression(arbre.a)} {OPERATEURS_PYTHON[code]} {self.expression(arbre.b)})"
+        if code == OP_ET:
+            return f"(bool({self.expression(arbre.a)}) and bool({self.expression(arbre.b)}))"
+        if code == OP_OU:
+            return f"(bool({self.expression(arbre.a)}) or bool({self.expression(arbre.b)}))"
+        if code == OP_INDEX:
+            return f"lire_element({arbre.a!r}, {self.lire(arbre.a)}, {self.expression(arbre.b)})"
+        if code == OP_LEN:
+            return f"len({self.lire(arbre.a)})"
+        if code == OP_POP_EXP:
+            return f"{self.lire(arbre.a)}.pop()"
+        if code == OP_ARRAY:
+            elements = extraire_arguments_depuis_exp_chain(arbre.a)
+            if not all(isinstance(element, (int, str)) for element in elements):
+                raise TraductionImpossible("tableau littéral")
+            return repr(elements)
+        if code == OP_MAP:
+            paires = extraire_paires_depuis_paire_chain(arbre.a)
+            return "{" + ", ".join(f"{self.expression(cle)}: {self.expression(valeur)}" for cle, valeur in paires) + "}"
+        if code == OP_CALL:
+            return f"appeler_fonction({arbre.a!r}, [])"
+        if code == OP_CALL_PARAM:
+            arguments = ", ".join(self.expression(argument) for argument in extraire_arguments_depuis_exp_chain(arbre.b))
+            return f"appeler_fonction({arbre.a!r}, [{arguments}])"
+        if code == OP_MAP_TAB:
+            return f"appliquer_map({arbre.a!r}, list({self.expression(arbre.b)}))"
+        if code == OP_REDUCE_TAB:
+            return f"appliquer_reduce({arbre.a!r}, list({self.expression(arbre.b)}), {self.expression(arbre.c)})"
+        raise TraductionImpossible(ETIQUETTES[code])
+
+
+def compiler_fonction(nom_fonction: str, fonction: Fonction) -> None:
+    try:
+        source = TraducteurPython(nom_fonction, fonction).traduire()
+        code_objet = compile(source, f"<jit {nom_fonction}>", "exec")
+    except (TraductionImpossible, SyntaxError):
+        # Désoptimisation : la fonction reste interprétée par l'arbre
+        fonction.compilable = False
+        return
+    espace: Dict[str, Any] = {
+        "NON_DEFINI": NON_DEFINI,
+        "afficher": afficher,
+        "appeler_fonction": appeler_fonction,
+        "appliquer_map": appliquer_map,
+        "appliquer_reduce": appliquer_reduce,
+        "lire_element": lire_element,
+        "lire_variable": lire_variable,
+        "supprimer_element": supprimer_element,
+    }
+    exec(code_objet, espace)
+    fonction.compilee = espace[f"jit_{nom_fonction}"]
+
+
+# ---------------------------------------------------------------------------
+# map / reduce : en parallèle pour les fonctions pures
+#
+# map(f, t) renvoie [f(x) pour x dans t] ; reduce(f, t, init) renvoie
+# f(...f(f(init, t[0]), t[1])..., t[n-1]). Quand f est une fonction pure (ni
+# variable libre, ni affichage, ni modification ou lecture indexée de tableau,
+# y compris dans les fonctions qu'elle appelle) et que le tableau a au moins
+# TAILLE_MIN_PARALLELE éléments, il est découpé en tranches traitées par un
+# pool de processus ; les résultats sont recollés dans l'ordre. Seuls les
+# tableaux d'entiers partent dans le pool : un tableau ou dictionnaire renvoyé
+# tel quel par f reviendrait en copie et perdrait son identité. Le reduce
+# n'est parallélisé que si f est reconnue associative (a + b ou a * b) sur des
+# entiers : sinon le regroupement par tranches changerait le résultat.
+# ---------------------------------------------------------------------------
+
+CODES_IMPURS = {
+    OP_PRINT, OP_PUSH, OP_POP_INST, OP_POP_EXP, OP_DEL, OP_ASSIGN_INDEX_TAB, OP_INDEX,
+    OP_MAP_TAB, OP_REDUCE_TAB,
+}
+
+pool_processus: Optional[ProcessPoolExecutor] = None
+
+
+def obtenir_pool() -> ProcessPoolExecutor:
+    global pool_processus
+    if pool_processus is None:
+        pool_processus = ProcessPoolExecutor(max_workers=NOMBRE_PROCESSUS)
+    return pool_processus
+
+
+def definitions_necessaires(nom_fonction: str) -> Optional[Dict[str, Tuple[Any, Any]]]:
+    # Définitions de f et des fonctions qu'elle appelle, None si l'une est impure ou absente
+    definitions: Dict[str, Tuple[Any, Any]] = {}
+    a_visiter = [nom_fonction]
+    while a_visiter:
+        nom = a_visiter.pop()
+        if nom in definitions:
+            continue
+        if nom not in fonctions or contient_code(fonctions[nom].corps, CODES_IMPURS):
+            return None
+        definitions[nom] = (fonctions[nom].noeud_parametres, fonctions[nom].corps)
+        appelees: set = set()
+        fonctions_appelees(fonctions[nom].corps, appelees)
+        a_visiter.extend(appelees)
+    if variables_libres(nom_fonction):
+        return None
+    return definitions
+
+
+def parallelisable(nom_fonction: str, elements: List[Any], arite: int) -> Optional[Dict[str, Tuple[Any, Any]]]:
+    if not MAP_PARALLELE_ACTIF or NOMBRE_PROCESSUS < 2 or len(elements) < TAILLE_MIN_PARALLELE:
         return None
+    if nom_fonction not in fonctions or len(fonctions[nom_fonction].parametres) != arite:
+        return None  # l'erreur d'arité est levée par le chemin série
+    return definitions_necessaires(nom_fonction)
+
+
+def decouper(elements: List[Any]) -> List[List[Any]]:
+    nombre_tranches = NOMBRE_PROCESSUS * 4
+    taille = -(-len(elements) // nombre_tranches)
+    return [elements[debut:debut + taille] for debut in range(0, len(elements), taille)]
+
+
+def traiter_tranche(definitions: Dict[str, Tuple[Any, Any]], nom_fonction: str, tranche: List[Any], reduire: bool) -> Any:
+    # Exécuté dans un processus du pool : état d'interpréteur propre à la tâche
+    fonctions.clear()
+    for nom, (noeud_parametres, corps) in definitions.items():
+        fonctions[nom] = Fonction(noeud_parametres, corps)
+    if reduire:
+        accumulateur = tranche[0]
+        for element in tranche[1:]:
+            accumulateur = appeler_fonction(nom_fonction, [accumulateur, element])
+        return accumulateur
+    return [appeler_fonction(nom_fonction, [element]) for element in tranche]
+
+
+def appliquer_map(nom_fonction: str, elements: List[Any]) -> List[Any]:
+    definitions = parallelisable(nom_fonction, elements, 1)
+    if definitions is None or not all(type(element) is int for element in elements):
+        return [appeler_fonction(nom_fonction, [element]) for element in elements]
+
+    tranches = decouper(elements)
+    resultats = obtenir_pool().map(
+        traiter_tranche, [definitions] * len(tranches), [nom_fonction] * len(tranches), tranches, [False] * len(tranches)
+    )
+    return [valeur for resultat in resultats for valeur in resultat]
+
+
+def est_reduction_associative(nom_fonction: str) -> bool:
+    corps = fonctions[nom_fonction].corps
+    if not (isinstance(corps, Noeud) and corps.code == OP_INST and corps.b is None):
+        return False
+    instruction = corps.a
+    if not (isinstance(instruction, Noeud) and instruction.code == OP_RETURN):
+        return False
+    expression = instruction.a
+    if not (isinstance(expression, Noeud) and CODE_GENERIQUE[expression.code] in (OP_PLUS, OP_FOIS)):
+        return False
+    parametres = fonctions[nom_fonction].parametres
+    return len(set(parametres)) == 2 and {expression.a, expression.b} == set(parametres)
+
+
+def appliquer_reduce(nom_fonction: str, elements: List[Any], initial: Any) -> Any:
+    definitions = parallelisable(nom_fonction, elements, 2)
+    if (
+        definitions is None
+        or not est_reduction_associative(nom_fonction)
+        or type(initial) is not int
+        or not all(type(element) is int for element in elements)
+    ):
+        accumulateur = initial
+        for element in elements:
+            accumulateur = appeler_fonction(nom_fonction, [accumulateur, element])
+        return accumulateur
+
+    tranches = decouper(elements)
+    resultats = obtenir_pool().map(
+        traiter_tranche, [definitions] * len(tranches), [nom_fonction] * len(tranches), tranches, [True] * len(tranches)
+    )
+    accumulateur = initial
+    for resultat in resultats:
+        accumulateur = appeler_fonction(nom_fonction, [accumulateur, resultat])
+    return accumulateur
+
+
+def evaluer_map_tab(noeud: Noeud2) -> Any:
+    return appliquer_map(noeud.a, list(evaluer_expression(noeud.b)))
+
+
+def evaluer_reduce_tab(noeud: Noeud3) -> Any:
+    elements = list(evaluer_expression(noeud.b))
+    return appliquer_reduce(noeud.a, elements, evaluer_expression(noeud.c))
+
 
-    raise ValueError(f"Expression inconnue : {etiquette!r}")
+TABLE_EXPRESSIONS[OP_MAP_TAB] = evaluer_map_tab
+TABLE_EXPRESSIONS[OP_REDUCE_TAB] = evaluer_reduce_tab
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+"""
+Serveur local de l'interpréteur : le lexer, les tables du parser et les
+processus du pool map / reduce restent chargés entre deux programmes.
+
+Protocole : une requête JSON par ligne {"programme": "..."} et une réponse
+JSON par ligne {"sortie": ..., "erreur": ..., "statut": 0 | 1, "duree": secondes}.
+Chaque requête part d'un état d'interpréteur neuf (reinitialiser_etat).
+
+    python serveurCalc.py serveur [--socket CHEMIN]   # socket Unix
+    python serveurCalc.py serveur --stdio             # une requête par ligne sur stdin
+    python serveurCalc.py client [--socket CHEMIN]    # se comporte comme python calcBaseV3.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import time
+import traceback
+from contextlib import redirect_stdout
+from typing import Any, Dict
+
+
+# Même invite que calcBaseV3 : le client ne l'importe pas pour rester léger
+PREFIXE_CONSOLE = "calc > "
+SOCKET_PAR_DEFAUT = os.path.join(tempfile.gettempdir(), f"calc-{os.getuid()}.sock")
+
+
+# ---------------------------------------------------------------------------
+# Serveur
+# ---------------------------------------------------------------------------
+
+def executer_requete(programme: str) -> Dict[str, Any]:
+    import calcBaseV3
+
+    sortie = io.StringIO()
+    erreur = ""
+    statut = 0
+    debut = time.perf_counter()
+    calcBaseV3.reinitialiser_etat()
+    try:
+        with redirect_stdout(sortie):
+            calcBaseV3.analyseur_syntaxique.parse(programme, lexer=calcBaseV3.analyseur_lexical)
+    except Exception:
+        erreur = traceback.format_exc()
+        statut = 1
+    duree = time.perf_counter() - debut
+    return {"sortie": sortie.getvalue(), "erreur": erreur, "statut": statut, "duree": duree}
+
+
+def repondre(ligne: str) -> str:
+    try:
+        programme = json.loads(ligne)["programme"]
+    except (ValueError, KeyError, TypeError):
+        reponse: Dict[str, Any] = {"sortie": "", "erreur": "Requête invalide\n", "statut": 1, "duree": 0.0}
+    else:
+        reponse = executer_requete(programme)
+    return json.dumps(reponse) + "\n"
+
+
+def prechauffer() -> None:
+    # Import (tables PLY) et démarrage des processus du pool avant la première requête
+    import calcBaseV3
+
+    if calcBaseV3.MAP_PARALLELE_ACTIF and calcBaseV3.NOMBRE_PROCESSUS > 1:
+        pool = calcBaseV3.obtenir_pool()
+        for futur in [pool.submit(os.getpid) for _ in range(calcBaseV3.NOMBRE_PROCESSUS)]:
+            futur.result()
+
+
+class GestionnaireRequete(socketserver.StreamRequestHandler):
+    # Une requête par connexion ; les requêtes sont traitées l'une après l'autre
+    def handle(self) -> None:
+        ligne = self.rfile.readline().decode("utf-8")
+        if not ligne:
+            return  # connexion fermée sans requête (test de socket_active)
+        self.wfile.write(repondre(ligne).encode("utf-8"))
+
+
+def arreter(_signal: int, _frame: Any) -> None:
+    sys.exit(0)
+
+
+def socket_active(chemin: str) -> bool:
+    # Un serveur répond-il déjà sur ce chemin ? Sinon le fichier est une socket orpheline
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connexion:
+        try:
+            connexion.connect(chemin)
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+    return True
+
+
+def servir_socket(chemin: str) -> int:
+    if socket_active(chemin):
+        sys.stderr.write(f"Un serveur écoute déjà sur {chemin}\n")
+        return 1
+    if os.path.exists(chemin):
+        os.unlink(chemin)
+    prechauffer()
+    signal.signal(signal.SIGTERM, arreter)  # kill : nettoyage de la socket comme avec Ctrl-C
+    with socketserver.UnixStreamServer(chemin, GestionnaireRequete) as serveur:
+        try:
+            serveur.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(chemin)
+    return 0
+
+
+def servir_stdio() -> None:
+    prechauffer()
+    for ligne in sys.stdin:
+        if ligne.strip():
+            sys.stdout.write(repondre(ligne))
+            sys.stdout.flush()
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+def envoyer(chemin: str, programme: str) -> Dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connexion:
+        connexion.connect(chemin)
+        connexion.sendall((json.dumps({"programme": programme}) + "\n").encode("utf-8"))
+        with connexion.makefile("r", encoding="utf-8") as flux:
+            return json.loads(flux.readline())
+
+
+def client(chemin: str, afficher_duree: bool) -> int:
+    saisie = input(PREFIXE_CONSOLE)
+    reponse = envoyer(chemin, saisie)
+    sys.stdout.write(reponse["sortie"])
+    sys.stderr.write(reponse["erreur"])
+    if afficher_duree:
+        sys.stderr.write(f"durée : {reponse['duree']:.6f} s\n")
+    return reponse["statut"]
+
+
+# ---------------------------------------------------------------------------
+# Exécution
+# ---------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serveur local de l'interpréteur calcBaseV3.")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+
+    serveur = commandes.add_parser("serveur", help="garder l'interpréteur chargé")
+    serveur.add_argument("--socket", default=SOCKET_PAR_DEFAUT, help="chemin de la socket Unix")
+    serveur.add_argument("--stdio", action="store_true", help="requêtes sur stdin, réponses sur stdout")
+
+    client_parser = commandes.add_parser("client", help="exécuter un programme via le serveur")
+    client_parser.add_argument("--socket", default=SOCKET_PAR_DEFAUT, help="chemin de la socket Unix")
+    client_parser.add_argument("--duree", action="store_true", help="afficher la durée d'exécution sur stderr")
+
+    arguments = parser.parse_args()
+    if arguments.commande == "serveur":
+        if arguments.stdio:
+            servir_stdio()
+            return 0
+        return servir_socket(arguments.socket)
+    return client(arguments.socket, arguments.duree)
+
+
+if __name__ == "__main__":
+    sys.exit(main())